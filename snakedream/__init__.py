@@ -1,6 +1,7 @@
 """Python interface for a Daydream controller."""
 
 from snakedream.device import DaydreamController
+from snakedream.gesture import GestureRecognizer
 from snakedream.graph import InputGraph
 from snakedream.models import Buttons, Movement, Position
 from snakedream.mouse import GyroscopeMouse, TouchpadMouse
@@ -8,6 +9,7 @@ from snakedream.mouse import GyroscopeMouse, TouchpadMouse
 __all__ = [
     "Buttons",
     "DaydreamController",
+    "GestureRecognizer",
     "GyroscopeMouse",
     "InputGraph",
     "Movement",
@@ -3,13 +3,26 @@
 import asyncio
 import json
 import sys
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
 from pprint import pprint
-from typing import NoReturn
+from typing import NoReturn, Optional
 
+from snakedream import config
+from snakedream.analysis import ColumnWriter, analyze
+from snakedream.calibration import GyroscopeCalibration
+from snakedream.capture import CaptureRecorder
 from snakedream.device import DaydreamController
+from snakedream.gamepad import GamepadFactory
 from snakedream.graph import InputGraph
-from snakedream.mouse import GyroscopeMouse, TouchpadMouse
+from snakedream.mouse import BaseMouse, GyroscopeMouse, TouchpadMouse
+from snakedream.pipeline import (
+    GyroscopeStage,
+    Pipeline,
+    StageDefinition,
+    load_definition,
+)
+from snakedream.realtime import RealtimeProfile, parse_cpus
+from snakedream.trace import Tracer
 
 
 def get_parser() -> ArgumentParser:
@@ -20,6 +33,24 @@ def get_parser() -> ArgumentParser:
         epilog="Copyright (C) 2025 Zack Didcott",
     )
 
+    parser.add_argument(
+        "--cpus",
+        type=parse_cpus,
+        default=None,
+        help="CPUs to pin process to with realtime profile, e.g. '2,3' or '2-3'",
+    )
+    parser.add_argument(
+        "--gamepad",
+        "-p",
+        action="store_true",
+        help="enable virtual gamepad",
+    )
+    parser.add_argument(
+        "--gamepad-rate",
+        type=float,
+        default=None,
+        help="maximum gamepad reports per second",
+    )
     parser.add_argument(
         "--graph",
         "-g",
@@ -36,13 +67,20 @@ def get_parser() -> ArgumentParser:
     parser.add_argument(
         "--json", "-j", action="store_true", help="output device information in JSON"
     )
+    parser.add_argument(
+        "--latency",
+        "-l",
+        type=float,
+        default=None,
+        help="maximum jitter buffer latency for mouse in milliseconds",
+    )
     parser.add_argument(
         "--mouse",
         "-m",
         type=str,
-        default="gyroscope",
+        default=None,
         choices=["gyroscope", "touchpad", "disable"],
-        help="enable mouse control",
+        help="enable mouse control (default: gyroscope)",
     )
     parser.add_argument(
         "--name",
@@ -51,12 +89,45 @@ def get_parser() -> ArgumentParser:
         default=DaydreamController.DEVICE_NAME,
         help="Bluetooth device name for Daydream controller",
     )
+    parser.add_argument(
+        "--no-calibration",
+        action="store_true",
+        help="disable gyroscope bias calibration for mouse",
+    )
+    parser.add_argument(
+        "--pipeline",
+        type=str,
+        nargs="?",
+        const="",
+        default=None,
+        metavar="FILE",
+        help="run mouse and JSON output as a fused pipeline, or custom pipeline file",
+    )
+    parser.add_argument(
+        "--priority",
+        type=int,
+        default=None,
+        help="SCHED_FIFO priority with realtime profile (default: 10)",
+    )
+    parser.add_argument(
+        "--realtime",
+        "-r",
+        action="store_true",
+        help="enable low-latency scheduling profile",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="record raw frames to capture file",
+    )
     parser.add_argument(
         "--sensitivity",
         "-s",
         type=int,
-        default=8,
-        help="mouse sensitivity",
+        default=None,
+        help="mouse sensitivity (default: 8)",
     )
     parser.add_argument(
         "--timeout",
@@ -65,14 +136,74 @@ def get_parser() -> ArgumentParser:
         default=10,
         help="timeout for Bluetooth device (negative values wait forever)",
     )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="write per-frame trace in Chrome trace-event format to file",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    analyze_parser = subparsers.add_parser(
+        "analyze", help="analyse and export capture file"
+    )
+    analyze_parser.add_argument("capture", type=str, help="path to capture file")
+    analyze_parser.add_argument(
+        "--output", "-o", type=str, default=None, help="path to export columns"
+    )
+    analyze_parser.add_argument(
+        "--format",
+        "-f",
+        type=str,
+        default="csv",
+        choices=["csv", "parquet", "arrow"],
+        help="format of exported columns",
+    )
+    analyze_parser.add_argument(
+        "--chunk-size",
+        "-c",
+        type=int,
+        default=65536,
+        help="number of frames to decode per chunk",
+    )
+    analyze_parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="number of worker processes (defaults to number of CPUs)",
+    )
+    analyze_parser.add_argument(
+        "--gap",
+        type=float,
+        default=0.05,
+        help="minimum interval between frames to report as gap in seconds",
+    )
 
     return parser
 
 
-async def _main() -> NoReturn:
+def get_pipeline_definition(args: Namespace) -> list[StageDefinition]:
+    """Return pipeline definition equivalent to command-line arguments."""
+    definition: list[StageDefinition] = []
+    if args.mouse != "disable":
+        stage: StageDefinition = {"stage": args.mouse, "sensitivity": args.sensitivity}
+        if args.mouse == "gyroscope":
+            stage["calibrate"] = not args.no_calibration
+        definition.append(stage)
+        definition.append({"stage": "mouse"})
+    if args.json:
+        definition.append({"stage": "json", "interval": args.interval})
+    return definition
+
+
+async def _main(
+    args: Namespace,
+    profile: Optional[RealtimeProfile] = None,
+    definition: Optional[list[StageDefinition]] = None,
+) -> NoReturn:
     """Connect to device and start specified callbacks."""
-    parser = get_parser()
-    args = parser.parse_args()
     timeout = float("inf") if args.timeout < 0 else args.timeout
     try:
         print(f"Attempting to connect to '{args.name}'...")
@@ -82,25 +213,147 @@ async def _main() -> NoReturn:
         print("Try pressing the Home button or charging the device.")
         sys.exit(1)
     async with controller:
-        await controller.start()
-        if args.mouse != "disable":
-            if args.mouse == "gyroscope":
-                mouse = GyroscopeMouse(controller, sensitivity=args.sensitivity)
-            elif args.mouse == "touchpad":
-                mouse = TouchpadMouse(controller, sensitivity=args.sensitivity)
-            await mouse.start()
-        if args.graph:
-            graph = InputGraph(controller)
-            await graph.start()
-        while True:
-            await asyncio.sleep(args.interval)
-            if args.json:
-                pprint(json.loads(await controller.to_json()))
+        if args.trace:
+            controller.tracer = Tracer(args.trace)
+            controller.tracer.start()
+        if profile is not None:
+            # Apply after starting helper threads, so they do not inherit it
+            profile.apply_loop()
+            print("Applied realtime profile:")
+            for setting in profile.applied:
+                print(f"  {setting}")
+        recorder = CaptureRecorder(controller, args.record) if args.record else None
+        mouse: Optional[BaseMouse] = None
+        pipeline: Optional[Pipeline] = None
+        try:
+            await controller.start()
+            if definition is not None:
+                pipeline = Pipeline.from_definition(controller, definition)
+                await pipeline.start()
+            elif args.mouse != "disable":
+                latency = args.latency / 1000 if args.latency is not None else None
+                if args.mouse == "gyroscope":
+                    mouse = GyroscopeMouse(
+                        controller,
+                        sensitivity=args.sensitivity,
+                        latency=latency,
+                        calibrate=not args.no_calibration,
+                    )
+                else:
+                    mouse = TouchpadMouse(
+                        controller, sensitivity=args.sensitivity, latency=latency
+                    )
+                await mouse.start()
+            if args.gamepad:
+                gamepad = GamepadFactory.get(config.GAMEPAD_BACKEND)(
+                    controller, rate=args.gamepad_rate
+                )
+                await gamepad.start()
+            if args.graph:
+                graph = InputGraph(controller)
+                await graph.start()
+            if recorder is not None:
+                await recorder.start()
+            while True:
+                await asyncio.sleep(args.interval)
+                if args.json and args.pipeline is None:
+                    pprint(json.loads(await controller.to_json()))
+                if mouse is not None and mouse.jitter_buffer is not None:
+                    print(
+                        f"Jitter buffer latency: {mouse.jitter_buffer.latency:.1f} ms"
+                    )
+        finally:
+            if mouse is not None and mouse.jitter_buffer is not None:
+                mouse.jitter_buffer.stop()
+            if controller.tracer is not None:
+                controller.tracer.close()
+            if recorder is not None:
+                recorder.close()
+            calibrations: list[Optional[GyroscopeCalibration]] = []
+            if isinstance(mouse, GyroscopeMouse):
+                calibrations.append(mouse.calibration)
+            if pipeline is not None:
+                calibrations.extend(
+                    stage.calibration
+                    for stage in pipeline.stages
+                    if isinstance(stage, GyroscopeStage)
+                )
+            for calibration in calibrations:
+                if calibration is None:
+                    continue
+                try:
+                    calibration.save()
+                except OSError as error:
+                    print(f"Could not save gyroscope calibration: {error}")
 
 
 def main() -> NoReturn:
     """Start asyncio loop for main entry point."""
-    asyncio.run(_main())
+    parser = get_parser()
+    args = parser.parse_args()
+    if args.command == "analyze":
+        if args.chunk_size <= 0:
+            parser.error("argument --chunk-size must be positive")
+        if args.workers is not None and args.workers <= 0:
+            parser.error("argument --workers must be positive")
+        try:
+            writer = ColumnWriter(args.output, args.format) if args.output else None
+        except ImportError as error:
+            print(error)
+            sys.exit(1)
+        try:
+            summary = analyze(
+                args.capture,
+                output=writer,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                gap=args.gap,
+            )
+        except OSError as error:
+            print(error)
+            sys.exit(1)
+        print(json.dumps(summary, indent=2))
+        sys.exit(0)
+    if args.gamepad_rate is not None and not args.gamepad:
+        parser.error("argument --gamepad-rate requires --gamepad")
+    if args.mouse == "disable" and args.latency is not None:
+        parser.error("argument --latency requires mouse control")
+    if args.pipeline is not None and args.latency is not None:
+        parser.error("argument --latency is not supported with --pipeline")
+    definition: Optional[list[StageDefinition]] = None
+    if args.pipeline:
+        options = {
+            "--json": args.json,
+            "--mouse": args.mouse is not None,
+            "--no-calibration": args.no_calibration,
+            "--sensitivity": args.sensitivity is not None,
+        }
+        for option, given in options.items():
+            if given:
+                parser.error(
+                    f"argument {option} is not supported with a pipeline file, "
+                    "configure the stages in the file instead"
+                )
+        try:
+            definition = load_definition(args.pipeline)
+        except (OSError, ValueError) as error:
+            parser.error(f"argument --pipeline: {error}")
+    if args.mouse is None:
+        args.mouse = "gyroscope"
+    if args.sensitivity is None:
+        args.sensitivity = 8
+    if args.pipeline == "":
+        definition = get_pipeline_definition(args)
+    profile = None
+    loop_factory = None
+    if args.realtime:
+        profile = RealtimeProfile(cpus=args.cpus)
+        if args.priority is not None:
+            profile.priority = args.priority
+        loop_factory = profile.apply()
+    elif args.cpus is not None or args.priority is not None:
+        parser.error("arguments --cpus and --priority require --realtime")
+    asyncio.run(_main(args, profile, definition), loop_factory=loop_factory)
 
 
 if __name__ == "__main__":
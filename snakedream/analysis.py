@@ -0,0 +1,307 @@
+"""Analyse and export raw-frame capture files in chunks."""
+
+import csv
+import math
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Any, Literal, Optional
+
+import numpy as np
+
+from snakedream.capture import iter_chunks, read_chunk
+from snakedream.constants import (
+    ACCELEROMETER_MODEL,
+    BUTTONS_MODEL,
+    GYROSCOPE_MODEL,
+    ORIENTATION_MODEL,
+    SEQUENCE_MODEL,
+    TIME_MODEL,
+    TOUCHPAD_MODEL,
+)
+from snakedream.models import ModelDefinition
+
+type ExportFormat = Literal["csv", "parquet", "arrow"]
+
+MODEL_DEFINITIONS = [
+    TIME_MODEL,
+    SEQUENCE_MODEL,
+    BUTTONS_MODEL,
+    ORIENTATION_MODEL,
+    ACCELEROMETER_MODEL,
+    GYROSCOPE_MODEL,
+    TOUCHPAD_MODEL,
+]
+BUTTONS = [f.name for f in fields(BUTTONS_MODEL.model)]
+AXES = [
+    f"{model.name}_{f.name}"
+    for model in (
+        ORIENTATION_MODEL,
+        ACCELEROMETER_MODEL,
+        GYROSCOPE_MODEL,
+        TOUCHPAD_MODEL,
+    )
+    for f in fields(model.model)
+]
+
+
+def _columns(model: ModelDefinition) -> list[str]:
+    """Return column names for model definition."""
+    if isinstance(model.data, dict):
+        return [f"{model.name}_{name}" for name in model.data]
+    return [model.name]
+
+
+COLUMNS = ["host_time"] + [
+    column for model in MODEL_DEFINITIONS for column in _columns(model)
+]
+
+
+@dataclass
+class ChunkResult:
+    """Dataclass to represent decoded columns and partial statistics of a chunk."""
+
+    columns: dict[str, np.ndarray]
+    count: int
+    first_time: float
+    last_time: float
+    gaps: list[tuple[float, float]]
+    sums: dict[str, tuple[float, float, float, float]]
+    first_buttons: dict[str, bool]
+    last_buttons: dict[str, bool]
+    transitions: list[tuple[float, str, bool]]
+
+
+def decode_chunk(path: str, start: int, count: int) -> dict[str, np.ndarray]:
+    """Return columns of decoded values for records in chunk."""
+    rows = []
+    for host_time, frame in read_chunk(path, start, count):
+        row: list[Any] = [host_time]
+        for model in MODEL_DEFINITIONS:
+            value = model.from_bytes(frame)
+            if isinstance(model.data, dict):
+                row.extend(getattr(value, name) for name in model.data)
+            else:
+                row.append(value)
+        rows.append(row)
+    array = np.array(rows, dtype=np.float64).reshape(-1, len(COLUMNS))
+    columns = {name: array[:, idx] for idx, name in enumerate(COLUMNS)}
+    for button in BUTTONS:
+        columns[f"buttons_{button}"] = columns[f"buttons_{button}"].astype(bool)
+    for name in ("time", "sequence"):
+        columns[name] = columns[name].astype(np.int32)
+    return columns
+
+
+def analyze_chunk(path: str, start: int, count: int, gap: float) -> ChunkResult:
+    """Return decoded columns and partial statistics for chunk."""
+    columns = decode_chunk(path, start, count)
+    times = columns["host_time"]
+    deltas = np.diff(times)
+    gaps = [
+        (float(times[idx]), float(deltas[idx])) for idx in np.nonzero(deltas > gap)[0]
+    ]
+    sums = {
+        axis: (
+            float(columns[axis].sum()),
+            float(np.square(columns[axis]).sum()),
+            float(columns[axis].min()),
+            float(columns[axis].max()),
+        )
+        for axis in AXES
+    }
+    transitions = []
+    for button in BUTTONS:
+        states = columns[f"buttons_{button}"]
+        for idx in np.nonzero(states[1:] != states[:-1])[0] + 1:
+            transitions.append((float(times[idx]), button, bool(states[idx])))
+    return ChunkResult(
+        columns=columns,
+        count=len(times),
+        first_time=float(times[0]),
+        last_time=float(times[-1]),
+        gaps=gaps,
+        sums=sums,
+        first_buttons={b: bool(columns[f"buttons_{b}"][0]) for b in BUTTONS},
+        last_buttons={b: bool(columns[f"buttons_{b}"][-1]) for b in BUTTONS},
+        transitions=transitions,
+    )
+
+
+@dataclass
+class Summary:
+    """Dataclass to merge partial statistics of chunks in order."""
+
+    gap: float
+    count: int = 0
+    first_time: Optional[float] = None
+    last_time: Optional[float] = None
+    gaps: list[tuple[float, float]] = field(default_factory=list)
+    sums: dict[str, list[float]] = field(default_factory=dict)
+    buttons: dict[str, bool] = field(default_factory=dict)
+    transitions: list[tuple[float, str, bool]] = field(default_factory=list)
+
+    def update(self, result: ChunkResult) -> None:
+        """Merge statistics of next chunk."""
+        if self.last_time is not None:
+            delta = result.first_time - self.last_time
+            if delta > self.gap:
+                self.gaps.append((self.last_time, delta))
+        if self.first_time is None:
+            self.first_time = result.first_time
+        for button, state in result.first_buttons.items():
+            if button in self.buttons and self.buttons[button] != state:
+                self.transitions.append((result.first_time, button, state))
+        self.count += result.count
+        self.last_time = result.last_time
+        self.gaps.extend(result.gaps)
+        self.buttons = result.last_buttons
+        self.transitions.extend(sorted(result.transitions))
+        for axis, (total, squares, minimum, maximum) in result.sums.items():
+            if axis not in self.sums:
+                self.sums[axis] = [0.0, 0.0, math.inf, -math.inf]
+            values = self.sums[axis]
+            values[0] += total
+            values[1] += squares
+            values[2] = min(values[2], minimum)
+            values[3] = max(values[3], maximum)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return dictionary of summary statistics."""
+        duration = (
+            self.last_time - self.first_time
+            if self.first_time is not None and self.last_time is not None
+            else 0.0
+        )
+        axes = {}
+        for axis, (total, squares, minimum, maximum) in self.sums.items():
+            mean = total / self.count
+            axes[axis] = {
+                "mean": mean,
+                "std": math.sqrt(max(squares / self.count - mean**2, 0)),
+                "min": minimum,
+                "max": maximum,
+            }
+        return {
+            "frames": self.count,
+            "duration": duration,
+            "rate": (self.count - 1) / duration if duration > 0 else 0.0,
+            "gaps": [{"time": time, "duration": delta} for time, delta in self.gaps],
+            "axes": axes,
+            "buttons": [
+                {"time": time, "button": button, "pressed": state}
+                for time, button, state in self.transitions
+            ],
+        }
+
+
+class ColumnWriter:
+    """Class to append chunks of columns to CSV, Parquet or Arrow file."""
+
+    def __init__(self, path: str, format: ExportFormat = "csv") -> None:
+        """
+        Initialise writer with output path and format.
+
+        Parquet and Arrow formats require pyarrow, which is imported here so a
+        missing installation is reported before any chunks are processed.
+        """
+        self.path = path
+        self.format = format
+        self._writer: Any = None
+        self._file: Any = None
+        if format != "csv":
+            try:
+                import pyarrow  # Only checking availability
+            except ImportError as error:
+                raise ImportError(
+                    f"Exporting to {format} requires pyarrow to be installed."
+                ) from error
+
+    def write(self, columns: dict[str, np.ndarray]) -> None:
+        """Append chunk of columns to file."""
+        if self.format == "csv":
+            if self._writer is None:
+                self._file = open(self.path, "w", newline="")
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(columns)
+            self._writer.writerows(
+                zip(*(column.tolist() for column in columns.values()))
+            )
+            return None
+
+        import pyarrow as pa
+
+        table = pa.table(columns)
+        if self._writer is None:
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            elif self.format == "arrow":
+                self._writer = pa.ipc.new_file(self.path, table.schema)
+            else:
+                raise ValueError(
+                    f"Invalid format '{self.format}'. Must be 'csv', 'parquet' or 'arrow'"
+                )
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        """Close output file."""
+        if self._writer is not None and self.format != "csv":
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = self._file = None
+
+
+def _results(
+    path: str, chunk_size: int, workers: int, gap: float
+) -> Iterator[ChunkResult]:
+    """Return iterator of chunk results in order, bounding chunks in flight."""
+    chunks = iter_chunks(path, chunk_size)
+    if workers <= 1:
+        for start, count in chunks:
+            yield analyze_chunk(path, start, count, gap)
+        return None
+    with ProcessPoolExecutor(workers) as executor:
+        pending: deque[Future[ChunkResult]] = deque()
+        for start, count in chunks:
+            pending.append(executor.submit(analyze_chunk, path, start, count, gap))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def analyze(
+    path: str,
+    output: Optional[str | ColumnWriter] = None,
+    format: ExportFormat = "csv",
+    chunk_size: int = 65536,
+    workers: Optional[int] = None,
+    gap: float = 0.05,
+) -> dict[str, Any]:
+    """
+    Return summary statistics of capture file, exporting decoded columns.
+
+    Output may be a path or writer. Chunks are decoded in parallel across a
+    process pool if more than one CPU is available, and written in order, so
+    memory use is bounded by the chunk size rather than the size of the file.
+    """
+    workers = workers or os.cpu_count() or 1
+    summary = Summary(gap=gap)
+    writer = ColumnWriter(output, format) if isinstance(output, str) else output
+    try:
+        for result in _results(path, chunk_size, workers, gap):
+            summary.update(result)
+            if writer is not None:
+                writer.write(result.columns)
+        if writer is not None and not summary.count:
+            # Write header or schema for empty capture
+            writer.write(decode_chunk(path, 0, 0))
+    finally:
+        if writer is not None:
+            writer.close()
+    return summary.to_dict()
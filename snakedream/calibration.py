@@ -0,0 +1,136 @@
+"""Estimate gyroscope bias online while the controller is at rest."""
+
+import json
+import math
+import os
+from typing import Optional
+
+from snakedream import config
+from snakedream.models import Movement
+
+# Gyroscope resolution in rad/s, matching scaling of GYROSCOPE_MODEL
+GYROSCOPE_LSB = 2048 / 180 * math.pi / 4095.0
+
+
+class GyroscopeCalibration:
+    """
+    Class to estimate and remove gyroscope bias.
+
+    Stillness is detected from the running variance of the accelerometer and
+    gyroscope, and every gyroscope sample being within still_rate of the bias.
+    While still, the bias of each gyroscope axis is updated incrementally
+    towards the measured rate, which should be zero at rest, and limited to
+    max_bias.
+
+    By default, still_rate is a few LSB, below the smallest rate which moves
+    the cursor at default sensitivity, so a pan is not learned as bias, and
+    max_bias is below still_rate, so any allowed bias can be learned from zero.
+    """
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        bias: tuple[float, float, float] = (0.0, 0.0, 0.0),
+        smoothing: float = 0.05,
+        rate: float = 0.02,
+        gyroscope_variance: float = 0.01,
+        accelerometer_variance: float = 0.05,
+        still_rate: float = 6 * GYROSCOPE_LSB,
+        max_bias: float = 3 * GYROSCOPE_LSB,
+        frames: int = 30,
+    ) -> None:
+        """Initialise calibration with device address and initial bias."""
+        self.address = address
+        self.max_bias = max_bias
+        self.bias = [self._clamp(value) for value in bias]
+        self.smoothing = smoothing
+        self.rate = rate
+        self.gyroscope_variance = gyroscope_variance
+        self.accelerometer_variance = accelerometer_variance
+        self.still_rate = still_rate
+        self.frames = frames
+        self.still = False
+        self._still_frames = 0
+        self._mean = [0.0] * 6
+        self._variance = [0.0] * 6
+        self._count = 0
+
+    @classmethod
+    def load(
+        cls: type["GyroscopeCalibration"],
+        address: Optional[str],
+        path: Optional[str] = None,
+        **kwargs,
+    ) -> "GyroscopeCalibration":
+        """Return calibration for device address, using saved bias if available."""
+        if path is None:
+            path = config.CALIBRATION_PATH
+        bias = (0.0, 0.0, 0.0)
+        try:
+            with open(path) as file:
+                x, y, z = json.load(file).get(address, bias)
+            bias = (float(x), float(y), float(z))
+        except (OSError, TypeError, ValueError):
+            pass
+        return cls(address, bias, **kwargs)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Save bias for device address, preserving other devices."""
+        if self.address is None:
+            return None
+        if path is None:
+            path = config.CALIBRATION_PATH
+        calibrations = {}
+        try:
+            with open(path) as file:
+                calibrations = json.load(file)
+        except (OSError, ValueError):
+            pass
+        calibrations[self.address] = [self._clamp(value) for value in self.bias]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(calibrations, file, indent=2)
+
+    def update(self, gyroscope: Movement, accelerometer: Movement) -> None:
+        """Update running variance, stillness and bias from new samples."""
+        samples = (
+            gyroscope.x,
+            gyroscope.y,
+            gyroscope.z,
+            accelerometer.x,
+            accelerometer.y,
+            accelerometer.z,
+        )
+        alpha = self.smoothing
+        for idx, value in enumerate(samples):
+            error = value - self._mean[idx]
+            self._mean[idx] += alpha * error
+            self._variance[idx] = (1 - alpha) * (self._variance[idx] + alpha * error**2)
+        self._count += 1
+
+        still = (
+            self._count >= self.frames
+            and max(self._variance[:3]) < self.gyroscope_variance
+            and max(self._variance[3:]) < self.accelerometer_variance
+            and all(
+                abs(samples[idx] - self.bias[idx]) < self.still_rate for idx in range(3)
+            )
+        )
+        self._still_frames = self._still_frames + 1 if still else 0
+        self.still = self._still_frames >= self.frames
+        if self.still:
+            for idx in range(3):
+                bias = self.bias[idx] + self.rate * (samples[idx] - self.bias[idx])
+                self.bias[idx] = self._clamp(bias)
+
+    def _clamp(self, value: float) -> float:
+        """Return bias limited to maximum magnitude."""
+        return min(max(value, -self.max_bias), self.max_bias)
+
+    def correct(self, gyroscope: Movement) -> tuple[float, float, float]:
+        """Return gyroscope rates with bias removed."""
+        return (
+            gyroscope.x - self.bias[0],
+            gyroscope.y - self.bias[1],
+            gyroscope.z - self.bias[2],
+        )
@@ -0,0 +1,63 @@
+"""Record and read raw-frame capture files."""
+
+import os
+import struct
+import time
+from collections.abc import Iterator
+from typing import BinaryIO, Optional
+
+from bleak import BleakGATTCharacteristic
+
+from snakedream.base import BaseCallback
+from snakedream.device import DaydreamController
+
+FRAME_SIZE = 20
+# Host time since epoch, followed by raw frame padded to FRAME_SIZE
+RECORD = struct.Struct(f"<d{FRAME_SIZE}s")
+
+
+class CaptureRecorder(BaseCallback):
+    """Handle recording of raw frames to capture file."""
+
+    def __init__(self, controller: DaydreamController, path: str) -> None:
+        """Initialise recorder with path of capture file."""
+        super().__init__(controller)
+        self.path = path
+        self._file: Optional[BinaryIO] = None
+
+    async def start(self) -> None:
+        """Open capture file and register callback for controller."""
+        self._file = open(self.path, "ab")
+        await super().start()
+
+    def close(self) -> None:
+        """Close capture file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def callback(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
+        """Define callback to write frame with host time to capture file."""
+        if self._file is not None:
+            self._file.write(RECORD.pack(time.time(), bytes(data)))
+
+
+def count_records(path: str) -> int:
+    """Return number of complete records in capture file."""
+    return os.path.getsize(path) // RECORD.size
+
+
+def read_chunk(path: str, start: int, count: int) -> list[tuple[float, bytes]]:
+    """Return records from capture file, starting at record index."""
+    with open(path, "rb") as file:
+        file.seek(start * RECORD.size)
+        data = file.read(count * RECORD.size)
+    size = len(data) - len(data) % RECORD.size
+    return list(RECORD.iter_unpack(data[:size]))
+
+
+def iter_chunks(path: str, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """Return iterator of start index and number of records for each chunk."""
+    total = count_records(path)
+    for start in range(0, total, chunk_size):
+        yield start, min(chunk_size, total - start)
@@ -0,0 +1,170 @@
+"""Synchronise device time with host clock and smooth delivery of frames."""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+
+class DeviceClock:
+    """
+    Class to map the wrapping device time counter onto the host monotonic clock.
+
+    The counter is unwrapped into a continuous device time, then related to host
+    time with an exponentially weighted linear fit, whose slope gives the drift
+    of the device clock relative to the host.
+    """
+
+    WRAP = 1 << 9  # TIME_MODEL is a 9-bit counter
+    PERIOD = 0.001  # Nominal duration of a single tick in seconds
+
+    MAX_DRIFT = 0.05  # Maximum relative drift of device clock
+    MIN_SPAN = 1.0  # Device time in seconds to observe before estimating drift
+
+    def __init__(
+        self, period: float = PERIOD, wrap: int = WRAP, smoothing: float = 0.02
+    ) -> None:
+        """Initialise instance with nominal tick period and smoothing factor."""
+        self.period = period
+        self.wrap = wrap
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard current synchronisation state."""
+        self._ticks: Optional[int] = None
+        self._host: Optional[float] = None
+        self._device = 0.0
+        self._mean_device = 0.0
+        self._mean_host = 0.0
+        self._variance = 0.0
+        self._covariance = 0.0
+        self._scale = 1.0
+
+    @property
+    def drift(self) -> float:
+        """Return estimated drift of device clock relative to host clock."""
+        return self._scale - 1.0
+
+    def _unwrap(self, ticks: int, host: float) -> float:
+        """Return continuous device time in seconds for counter value."""
+        if self._ticks is None or self._host is None:
+            return 0.0
+        delta = (ticks - self._ticks) % self.wrap
+        # If notifications stalled for longer than a full wrap, use host time
+        # to recover the number of missed wraps. The nominal period is used,
+        # as the estimated drift is not reliable enough to count wraps.
+        elapsed = (host - self._host) / self.period
+        delta += self.wrap * max(0, round((elapsed - delta) / self.wrap))
+        return self._device + delta * self.period
+
+    def update(self, ticks: int, host: Optional[float] = None) -> float:
+        """Add observation of counter value and return estimated host time."""
+        host = time.monotonic() if host is None else host
+        first = self._ticks is None
+        self._device = self._unwrap(ticks, host)
+        self._ticks, self._host = ticks, host
+        if first:
+            self._mean_device, self._mean_host = self._device, host
+            return host
+
+        alpha = self.smoothing
+        device_error = self._device - self._mean_device
+        host_error = host - self._mean_host
+        self._mean_device += alpha * device_error
+        self._mean_host += alpha * host_error
+        self._variance = (1 - alpha) * (self._variance + alpha * device_error**2)
+        self._covariance = (1 - alpha) * (
+            self._covariance + alpha * device_error * host_error
+        )
+        # Bursts of notifications with near-identical host times give a
+        # meaningless slope, so only estimate drift over a sufficient span,
+        # and limit it to a plausible range.
+        if self._device >= self.MIN_SPAN and self._variance > 0:
+            self._scale = min(
+                max(self._covariance / self._variance, 1 - self.MAX_DRIFT),
+                1 + self.MAX_DRIFT,
+            )
+        return self.to_host(self._device)
+
+    def to_host(self, device: float) -> float:
+        """Return estimated host time for continuous device time."""
+        return self._mean_host + self._scale * (device - self._mean_device)
+
+
+class JitterBuffer:
+    """
+    Class to buffer frames and release them at evenly spaced host times.
+
+    Frames are released at their synchronised host time plus a delay, which
+    adapts to the observed jitter between minimum and maximum values.
+    """
+
+    def __init__(
+        self,
+        consumer: Callable[[Any], Awaitable[None]],
+        clock: Optional[DeviceClock] = None,
+        min_delay: float = 0.0,
+        max_delay: float = 0.05,
+        adaptive: bool = True,
+        smoothing: float = 0.05,
+    ) -> None:
+        """Initialise instance with consumer for released frames."""
+        self.consumer = consumer
+        self.clock = clock or DeviceClock()
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.adaptive = adaptive
+        self.smoothing = smoothing
+        self.delay = max_delay if not adaptive else min_delay
+        self.jitter = 0.0
+        self._frames: deque[tuple[float, Any]] = deque()
+        self._event = asyncio.Event()
+        self._last_release = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def latency(self) -> float:
+        """Return latency added by buffer in milliseconds."""
+        return self.delay * 1000
+
+    def push(self, frame: Any, ticks: int, host: Optional[float] = None) -> None:
+        """Add frame with device counter value to buffer."""
+        host = time.monotonic() if host is None else host
+        expected = self.clock.update(ticks, host)
+        if self.adaptive:
+            # Track mean absolute deviation of arrival from the clock model,
+            # and hold enough to cover most late arrivals.
+            self.jitter += self.smoothing * (abs(host - expected) - self.jitter)
+            self.delay = min(self.max_delay, max(self.min_delay, 3 * self.jitter))
+        release = max(expected + self.delay, self._last_release)
+        self._last_release = release
+        self._frames.append((release, frame))
+        self._event.set()
+
+    async def run(self) -> None:
+        """Release buffered frames to consumer at their scheduled time."""
+        while True:
+            if not self._frames:
+                self._event.clear()
+                await self._event.wait()
+                continue
+            release, frame = self._frames[0]
+            remaining = release - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            self._frames.popleft()
+            await self.consumer(frame)
+
+    def start(self) -> None:
+        """Start releasing frames in background task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        """Stop releasing frames and discard buffered frames."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._frames.clear()
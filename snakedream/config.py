@@ -1,4 +1,17 @@
 """Snakedream configuration file."""
 
+import os
+from typing import Literal
+
 # Available backends: "default", "uinput", "pyautogui"
 MOUSE_BACKEND = "default"
+
+# Available backends: "default", "uinput"
+GAMEPAD_BACKEND: Literal["default", "uinput"] = "default"
+
+# Path to saved gyroscope calibration for each device address
+CALIBRATION_PATH = os.path.join(
+    os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config")),
+    "snakedream",
+    "calibration.json",
+)
@@ -1,7 +1,8 @@
 """Provide methods and attributes to handle a Daydream controller."""
 
 import json
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, Optional
 
 from bleak import BleakClient, BleakGATTCharacteristic, BleakScanner
 
@@ -15,6 +16,13 @@ from snakedream.constants import (
     TOUCHPAD_MODEL,
 )
 from snakedream.models import BaseModel, ModelJSONEncoder
+from snakedream.stream import FrameStream, StreamPolicy
+from snakedream.subscription import (
+    Subscription,
+    SubscriptionCallback,
+    SubscriptionIndex,
+)
+from snakedream.trace import Tracer, span
 
 
 class DaydreamController(BleakClient):
@@ -44,6 +52,11 @@ class DaydreamController(BleakClient):
         self._callbacks: list[
             Callable[[BleakGATTCharacteristic, bytearray], Awaitable[None]]
         ] = []
+        self._subscriptions = SubscriptionIndex(self.MODEL_DEFINITIONS)
+        self._frame_streams: set[FrameStream] = set()
+        self._state_streams: set[FrameStream] = set()
+        self.frame_count = 0
+        self.tracer: Optional[Tracer] = None
 
     @classmethod
     async def from_name(
@@ -71,12 +84,73 @@ class DaydreamController(BleakClient):
         """Register callback to be executed on notification."""
         self._callbacks.append(callback)
 
+    async def subscribe(
+        self,
+        callback: SubscriptionCallback,
+        fields: Iterable[str],
+        threshold: float = 0,
+    ) -> Subscription:
+        """
+        Subscribe callback to changes of specified fields.
+
+        The callback is passed a dictionary of changed field names and values,
+        and is only called when a value changes by more than threshold.
+        """
+        subscription = Subscription(callback, tuple(fields), threshold)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove subscription from controller."""
+        self._subscriptions.remove(subscription)
+
+    def frames(
+        self, maxsize: int = 64, policy: StreamPolicy | str = StreamPolicy.ALL
+    ) -> FrameStream:
+        """
+        Return async iterator of raw frames received from controller.
+
+        For example: `async with controller.frames() as frames:`, then
+        `async for data in frames:`.
+        """
+        stream = FrameStream(maxsize, policy, on_close=self._frame_streams.discard)
+        self._frame_streams.add(stream)
+        return stream
+
+    def states(
+        self, maxsize: int = 64, policy: StreamPolicy | str = StreamPolicy.ALL
+    ) -> FrameStream:
+        """Return async iterator of dictionaries of parsed data for each frame."""
+        stream = FrameStream(maxsize, policy, on_close=self._state_streams.discard)
+        self._state_streams.add(stream)
+        return stream
+
+    def _publish(self, data: bytearray) -> None:
+        """Add frame and parsed data to open streams."""
+        for stream in self._frame_streams:
+            stream.put(data)
+        for stream in self._state_streams:
+            stream.put(self._data)
+
     async def callback(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
         """Define callback for characteristic notifications."""
-        self._data = await self.parse_data(data)
-        self.__dict__.update(self._data)
-        for callback in self._callbacks:
-            await callback(sender, data)
+        self.frame_count += 1
+        tracer = self.tracer
+        args: dict[str, Any] = {"frame": self.frame_count}
+        if tracer is not None:
+            # Decode device sequence before parsing, so every span includes it
+            args["sequence"] = SEQUENCE_MODEL.from_bytes(data)
+        with span(tracer, "notification", **args):
+            with span(tracer, "parse_data", **args):
+                self._data = await self.parse_data(data)
+                self.__dict__.update(self._data)
+            self._publish(data)
+            for callback in self._callbacks:
+                with span(tracer, callback.__qualname__, **args):
+                    await callback(sender, data)
+            if self._subscriptions:
+                with span(tracer, "dispatch", **args):
+                    await self._subscriptions.dispatch(self._data)
 
     async def parse_data(self, data: bytearray) -> dict[str, float | BaseModel]:
         """Return dictionary of parsed data."""
@@ -0,0 +1,5 @@
+"""Gamepad support for Daydream controller."""
+
+from snakedream.gamepad.base import BaseGamepad, GamepadFactory
+
+__all__ = ["BaseGamepad", "GamepadFactory"]
@@ -0,0 +1,141 @@
+"""Handle base gamepad support."""
+
+import math
+import time
+from abc import abstractmethod
+from typing import Literal, Optional
+
+from bleak import BleakGATTCharacteristic
+
+from snakedream.base import BaseCallback
+from snakedream.device import DaydreamController
+
+type UInputEvent = tuple[int, int]
+
+
+class BaseGamepad(BaseCallback):
+    """
+    Base class to handle gamepad reports.
+
+    Controller fields are mapped to absolute axes and buttons with the _EVENTS
+    class attribute. Each frame produces a single report, containing only
+    events which changed, followed by a synchronisation event.
+    """
+
+    _EVENTS: dict[str, UInputEvent]
+
+    RESOLUTION = 32767
+    AXES: dict[str, tuple[float, float]] = {
+        "orientation.x": (-math.tau, math.tau),
+        "orientation.y": (-math.tau, math.tau),
+        "orientation.z": (-math.tau, math.tau),
+        "gyroscope.x": (-2048 / 180 * math.pi, 2048 / 180 * math.pi),
+        "gyroscope.y": (-2048 / 180 * math.pi, 2048 / 180 * math.pi),
+        "gyroscope.z": (-2048 / 180 * math.pi, 2048 / 180 * math.pi),
+        "touchpad.x": (0, 1),
+        "touchpad.y": (0, 1),
+    }
+    BUTTONS = ["click", "app", "home", "volume_down", "volume_up"]
+
+    def __init__(
+        self,
+        controller: DaydreamController,
+        rate: Optional[float] = None,
+        *args,
+        **kwargs,
+    ) -> None:
+        """
+        Initialise instance of gamepad device.
+
+        If rate is specified, axis reports are limited to that many per second,
+        with changes from skipped frames coalesced into the next report. Button
+        changes are always reported immediately.
+        """
+        super().__init__(controller, *args, **kwargs)
+        self.rate = rate
+        self._values: dict[str, int] = {}
+        self._last_report = 0.0
+        if not hasattr(self, "_EVENTS"):
+            raise NotImplementedError("Class attribute '_EVENTS' is not defined")
+
+    @abstractmethod
+    def emit(self, event: UInputEvent, value: int) -> None:
+        """Emit event without synchronisation."""
+        ...
+
+    @abstractmethod
+    def syn(self) -> None:
+        """Emit synchronisation event to complete report."""
+        ...
+
+    async def callback(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
+        """Define callback to emit report of changed axes and buttons."""
+        now = time.monotonic()
+        # Buttons bypass the rate limit, so short presses are not lost
+        limited = (
+            self.rate is not None
+            and self.rate > 0
+            and now - self._last_report < 1 / self.rate
+        )
+        values = self.get_buttons()
+        if not limited:
+            values.update(self.get_axes())
+        changed = False
+        for name, value in values.items():
+            if self._values.get(name) != value:
+                self.emit(self._EVENTS[name], value)
+                self._values[name] = value
+                changed = True
+        if changed:
+            self.syn()
+            if not limited:
+                self._last_report = now
+
+    def get_axes(self) -> dict[str, int]:
+        """Return dictionary of absolute axis values for current controller state."""
+        values = {}
+        touchpad = self.controller.touchpad
+        # Report untouched touchpad as centre, rather than top-left
+        untouched = touchpad.x == 0 and touchpad.y == 0
+        for name, limits in self.AXES.items():
+            model, _, attribute = name.partition(".")
+            value = getattr(getattr(self.controller, model), attribute)
+            if model == "touchpad" and untouched:
+                value = sum(limits) / 2
+            values[name] = self._scale(value, *limits)
+        return values
+
+    def get_buttons(self) -> dict[str, int]:
+        """Return dictionary of button values for current controller state."""
+        return {
+            button: int(getattr(self.controller.buttons, button))
+            for button in self.BUTTONS
+        }
+
+    def _scale(self, value: float, minimum: float, maximum: float) -> int:
+        """Return value scaled from limits to absolute axis resolution."""
+        value = min(max(value, minimum), maximum)
+        return round(
+            (2 * (value - minimum) / (maximum - minimum) - 1) * self.RESOLUTION
+        )
+
+
+class GamepadFactory:
+    """Factory class to provide appropriate gamepad implementation for platform."""
+
+    @staticmethod
+    def _get_uinput() -> type[BaseGamepad]:
+        """Return UInput gamepad implementation class."""
+        from snakedream.gamepad.device import UInputGamepad
+
+        return UInputGamepad
+
+    @staticmethod
+    def get(backend: Literal["default", "uinput"] = "default") -> type[BaseGamepad]:
+        """Return specified gamepad implementation or default for platform."""
+        if backend in ("default", "uinput"):
+            return GamepadFactory._get_uinput()
+        else:
+            raise ValueError(
+                f"Invalid backend '{backend}'. Must be 'default' or 'uinput'"
+            )
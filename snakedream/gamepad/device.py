@@ -0,0 +1,66 @@
+"""Handle virtual gamepad device."""
+
+from typing import Any, Optional
+
+import uinput
+
+from snakedream.device import DaydreamController
+from snakedream.gamepad.base import BaseGamepad, UInputEvent
+
+
+class UInputGamepad(BaseGamepad):
+    """
+    UInput implementation of gamepad support.
+
+    Events are written to the device attribute, which is created from the
+    events if not passed, and only requires emit and syn methods.
+    """
+
+    _EVENTS = {
+        "touchpad.x": uinput.ABS_X,
+        "touchpad.y": uinput.ABS_Y,
+        "orientation.x": uinput.ABS_RX,
+        "orientation.y": uinput.ABS_RY,
+        "orientation.z": uinput.ABS_RZ,
+        "gyroscope.x": uinput.ABS_Z,
+        "gyroscope.y": uinput.ABS_THROTTLE,
+        "gyroscope.z": uinput.ABS_RUDDER,
+        "click": uinput.BTN_SOUTH,
+        "app": uinput.BTN_EAST,
+        "home": uinput.BTN_MODE,
+        "volume_down": uinput.BTN_TL,
+        "volume_up": uinput.BTN_TR,
+    }
+
+    def __init__(
+        self,
+        controller: DaydreamController,
+        rate: Optional[float] = None,
+        name: str = DaydreamController.DEVICE_NAME,
+        device: Optional[Any] = None,
+        *args,
+        **kwargs,
+    ) -> None:
+        """Initialise instance of gamepad device."""
+        super().__init__(controller, rate, *args, **kwargs)
+        self.device = device or uinput.Device(self.events, name=name)
+
+    @property
+    def events(self) -> list[tuple[int, ...]]:
+        """Return events supported by device, with limits for absolute axes."""
+        return [
+            (
+                event + (-self.RESOLUTION, self.RESOLUTION, 0, 0)
+                if name in self.AXES
+                else event
+            )
+            for name, event in self._EVENTS.items()
+        ]
+
+    def emit(self, event: UInputEvent, value: int) -> None:
+        """Emit event without synchronisation."""
+        self.device.emit(event, value, syn=False)
+
+    def syn(self) -> None:
+        """Emit synchronisation event to complete report."""
+        self.device.syn()
@@ -0,0 +1,209 @@
+"""Recognise motion gestures from gyroscope and accelerometer data."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from bleak import BleakGATTCharacteristic
+
+from snakedream.base import BaseCallback
+from snakedream.device import DaydreamController
+
+type GestureAction = Callable[[str], Awaitable[None]]
+
+CHANNELS = 6  # Gyroscope x, y, z and accelerometer x, y, z
+
+
+@dataclass
+class GestureTemplate:
+    """Dataclass to represent a gesture as samples of shape (frames, channels)."""
+
+    name: str
+    samples: np.ndarray
+    threshold: float = 0.8
+
+    def resample(self, frames: int) -> np.ndarray:
+        """Return samples linearly resampled to number of frames."""
+        if len(self.samples) == frames:
+            return self.samples
+        source = np.linspace(0, 1, len(self.samples))
+        target = np.linspace(0, 1, frames)
+        return np.stack(
+            [np.interp(target, source, channel) for channel in self.samples.T], axis=1
+        )
+
+
+def _pulse(frames: int, centre: float = 0.5, width: float = 0.1) -> np.ndarray:
+    """Return Gaussian pulse at relative position in number of frames."""
+    x = np.linspace(0, 1, frames)
+    return np.exp(-(((x - centre) / width) ** 2))
+
+
+def default_templates(frames: int = 30) -> list[GestureTemplate]:
+    """Return templates for built-in flick, shake and twist gestures."""
+    flick = np.zeros((frames, CHANNELS))
+    flick[:, 0] = 10 * _pulse(frames)  # Fast pitch about x-axis
+    shake = np.zeros((frames, CHANNELS))
+    shake[:, 3] = 20 * np.sin(np.linspace(0, 6 * np.pi, frames))  # Along x-axis
+    twist = np.zeros((frames, CHANNELS))
+    # Roll about z-axis and return
+    twist[:, 2] = 8 * (_pulse(frames, 1 / 3) - _pulse(frames, 2 / 3))
+    return [
+        GestureTemplate("flick", flick),
+        GestureTemplate("shake", shake),
+        GestureTemplate("twist", twist),
+    ]
+
+
+def save_templates(path: str, templates: Iterable[GestureTemplate]) -> None:
+    """
+    Save templates to compressed NumPy archive.
+
+    Templates may have different numbers of frames, so samples are stored
+    concatenated, with the offset of each template in the samples array.
+    """
+    templates = list(templates)
+    lengths = [len(template.samples) for template in templates]
+    np.savez_compressed(
+        path,
+        names=np.array([template.name for template in templates]),
+        thresholds=np.array([template.threshold for template in templates]),
+        offsets=np.cumsum([0] + lengths),
+        samples=np.concatenate(
+            [np.empty((0, CHANNELS), dtype=np.float32)]
+            + [template.samples.astype(np.float32) for template in templates]
+        ),
+    )
+
+
+def load_templates(path: str) -> list[GestureTemplate]:
+    """Return templates loaded from compressed NumPy archive."""
+    with np.load(path) as archive:
+        samples, offsets = archive["samples"].astype(np.float64), archive["offsets"]
+        return [
+            GestureTemplate(str(name), samples[start:end], float(threshold))
+            for name, threshold, start, end in zip(
+                archive["names"], archive["thresholds"], offsets[:-1], offsets[1:]
+            )
+        ]
+
+
+class GestureRecognizer(BaseCallback):
+    """
+    Handle streaming recognition of motion gestures.
+
+    Samples are kept in a fixed window, which is compared with every template
+    on each frame, using normalised cross-correlation computed as a single
+    matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        controller: DaydreamController,
+        templates: Optional[Iterable[GestureTemplate]] = None,
+        actions: Mapping[str, GestureAction] = {},
+        frames: int = 30,
+        min_energy: float = 0.5,
+    ) -> None:
+        """Initialise recogniser with templates, actions and window size."""
+        super().__init__(controller)
+        self.actions = actions
+        self.frames = frames
+        self.min_energy = min_energy
+        # Samples are written twice, so the window is always a contiguous view
+        self._buffer = np.zeros((2 * frames, CHANNELS))
+        self._index = 0
+        self._count = 0
+        self._holdoff = 0
+        self._recording: Optional[list[np.ndarray]] = None
+        self._recorded = asyncio.Event()
+        self.latency = 0.0
+        self.cpu = 0.0
+        self.set_templates(
+            default_templates(frames) if templates is None else templates
+        )
+
+    def set_templates(self, templates: Iterable[GestureTemplate]) -> None:
+        """Precompute normalised matrix of templates for matching."""
+        self.templates = list(templates)
+        matrix = np.zeros((len(self.templates), self.frames * CHANNELS))
+        for idx, template in enumerate(self.templates):
+            matrix[idx] = self._normalise(template.resample(self.frames))
+        self._matrix = matrix
+        self._thresholds = np.array([template.threshold for template in self.templates])
+
+    @staticmethod
+    def _normalise(window: np.ndarray) -> np.ndarray:
+        """Return flattened window with zero mean per channel and unit norm."""
+        window = (window - window.mean(axis=0)).ravel()
+        norm = np.linalg.norm(window)
+        return window / norm if norm > 0 else window
+
+    @property
+    def window(self) -> np.ndarray:
+        """Return view of samples in window, from oldest to newest."""
+        return self._buffer[self._index : self._index + self.frames]
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Return mean processing latency and CPU time per frame in microseconds."""
+        return {"latency": self.latency * 1e6, "cpu": self.cpu * 1e6}
+
+    def add_sample(self, sample: np.ndarray) -> Optional[str]:
+        """Add sample to window and return name of recognised gesture, if any."""
+        self._buffer[self._index] = self._buffer[self._index + self.frames] = sample
+        self._index = (self._index + 1) % self.frames
+        self._count += 1
+        if self._holdoff:
+            self._holdoff -= 1
+            return None
+        if self._count < self.frames or not len(self.templates):
+            return None
+        window = self.window
+        if window.std(axis=0).max() < self.min_energy:
+            return None
+        scores = self._matrix @ self._normalise(window)
+        best = int(np.argmax(scores - self._thresholds))
+        if scores[best] < self._thresholds[best]:
+            return None
+        # Avoid recognising the same motion again as it leaves the window
+        self._holdoff = self.frames
+        return self.templates[best].name
+
+    async def callback(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
+        """Define callback to recognise gestures and call mapped actions."""
+        start, cpu = time.perf_counter(), time.process_time()
+        gyroscope, accelerometer = (
+            self.controller.gyroscope,
+            self.controller.accelerometer,
+        )
+        sample = np.array(
+            [
+                gyroscope.x,
+                gyroscope.y,
+                gyroscope.z,
+                accelerometer.x,
+                accelerometer.y,
+                accelerometer.z,
+            ]
+        )
+        if self._recording is not None:
+            self._recording.append(sample)
+            if len(self._recording) >= self.frames:
+                self._recorded.set()
+        gesture = self.add_sample(sample)
+        self.latency += 0.05 * (time.perf_counter() - start - self.latency)
+        self.cpu += 0.05 * (time.process_time() - cpu - self.cpu)
+        if gesture is not None and gesture in self.actions:
+            await self.actions[gesture](gesture)
+
+    async def record(self, name: str, threshold: float = 0.8) -> GestureTemplate:
+        """Return template recorded from next window of samples."""
+        self._recording = []
+        self._recorded.clear()
+        await self._recorded.wait()
+        samples, self._recording = np.stack(self._recording[: self.frames]), None
+        return GestureTemplate(name, samples, threshold)
@@ -5,14 +5,18 @@ from abc import abstractmethod
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from enum import StrEnum, auto
-from typing import Any, Literal, Optional
+from types import SimpleNamespace
+from typing import Any, ContextManager, Literal, Optional
 
 from bleak import BleakGATTCharacteristic
 
 from snakedream import config
 from snakedream.base import BaseCallback
+from snakedream.calibration import GyroscopeCalibration
+from snakedream.clock import JitterBuffer
 from snakedream.device import DaydreamController
-from snakedream.models import Buttons
+from snakedream.models import Buttons, Movement, Position
+from snakedream.trace import span
 
 type UInputEvent = tuple[int, int]
 type InputEvent = UInputEvent | str
@@ -51,17 +55,62 @@ class BaseMouse(BaseCallback):
             ButtonMapping(button="volume_up", action="scroll", args=(1,)),
             ButtonMapping(button="volume_down", action="scroll", args=(-1,)),
         ],
+        latency: Optional[float] = None,
         *args,
         **kwargs,
     ) -> None:
-        """Initialise instance of mouse device."""
+        """
+        Initialise instance of mouse device.
+
+        If latency is specified, frames are held in a jitter buffer for up to
+        that many seconds, to be released at evenly spaced intervals.
+        """
         super().__init__(controller, *args, **kwargs)
         self.sensitivity = sensitivity
         self.buttons = buttons
         self._state: dict[str, bool] = {}
+        # Controller state for the frame being handled
+        self.frame: Any = controller
+        self.jitter_buffer = (
+            JitterBuffer(self._release, max_delay=latency)
+            if latency is not None
+            else None
+        )
         if not hasattr(self, "_BUTTONS"):
             raise NotImplementedError("Class attribute '_BUTTONS' is not defined")
 
+    async def start(self) -> None:
+        """Register mouse callback for controller, via jitter buffer if enabled."""
+        if self.jitter_buffer is None:
+            return await super().start()
+        await self.controller.register_callback(self._buffer)
+        self.jitter_buffer.start()
+
+    async def _buffer(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
+        """Add frame and its parsed data to jitter buffer."""
+        self.jitter_buffer.push(  # type: ignore[union-attr]
+            (sender, data, self.controller._data, self.controller.frame_count),
+            self.controller.time,
+        )
+
+    async def _release(
+        self, frame: tuple[BleakGATTCharacteristic, bytearray, dict[str, Any], int]
+    ) -> None:
+        """Handle frame released from jitter buffer."""
+        sender, data, parsed, frame_count = frame
+        self.frame = SimpleNamespace(**parsed, frame_count=frame_count)
+        with self._span("release"):
+            await self.callback(sender, data)
+
+    def _span(self, name: str) -> ContextManager[None]:
+        """Return trace span for backend call in current frame."""
+        return span(
+            self.controller.tracer,
+            name,
+            frame=self.frame.frame_count,
+            sequence=self.frame.sequence,
+        )
+
     @abstractmethod
     async def move(self, x: int, y: int) -> None:
         """Move mouse to specified location."""
@@ -80,7 +129,7 @@ class BaseMouse(BaseCallback):
     @abstractmethod
     async def callback(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
         """Define callback to handle mouse events."""
-        await self.handle_buttons(self.controller.buttons)
+        await self.handle_buttons(self.frame.buttons)
 
     async def handle_buttons(self, buttons: Buttons) -> None:
         """Handle button input according to current button mapping."""
@@ -100,6 +149,30 @@ class BaseMouse(BaseCallback):
         return round(x * self.sensitivity), round(y * self.sensitivity)
 
 
+def touchpad_movement(touchpad: Position) -> Optional[tuple[float, float]]:
+    """Return x, y movement from touchpad position, or None if untouched."""
+    if touchpad.x == 0 and touchpad.y == 0:
+        return None
+    # Convert |_ to -|- axes
+    return touchpad.x * 2 - 1, touchpad.y * 2 - 1
+
+
+def gyroscope_movement(
+    gyroscope: Movement,
+    accelerometer: Movement,
+    calibration: Optional[GyroscopeCalibration] = None,
+) -> tuple[float, float]:
+    """Return x, y movement from gyroscope rotation, with bias removed."""
+    if calibration is not None:
+        calibration.update(gyroscope, accelerometer)
+        rotation_x, rotation_y, _ = calibration.correct(gyroscope)
+    else:
+        rotation_x, rotation_y = gyroscope.x, gyroscope.y
+    # Gyroscope attributes refer to axes of rotation, hence the
+    # y-coordinate relates to rotation about the x-axis.
+    return -rotation_y, -rotation_x
+
+
 class MouseFactory:
     """Factory class to provide appropriate mouse implementation for platform."""
 
@@ -153,22 +226,37 @@ class TouchpadMouse(MouseFactory.get(config.MOUSE_BACKEND)):
         """Define callback to handle mouse events."""
         await super().callback(sender, data)
 
-        if self.controller.touchpad.x == 0 and self.controller.touchpad.y == 0:
+        movement = touchpad_movement(self.frame.touchpad)
+        if movement is None:
             return None
-        # Convert |_ to -|- axes
-        x = self.controller.touchpad.x * 2 - 1
-        y = self.controller.touchpad.y * 2 - 1
-        await self.move(*self._calculate_movement(x, y))
+        await self.move(*self._calculate_movement(*movement))
 
 
 class GyroscopeMouse(MouseFactory.get(config.MOUSE_BACKEND)):
     """Mouse subclass to use Daydream controller gyroscope for mouse control."""
 
+    def __init__(
+        self, controller: DaydreamController, *args, calibrate: bool = True, **kwargs
+    ) -> None:
+        """
+        Initialise instance of mouse device.
+
+        If calibrate is True, gyroscope bias is estimated while the controller
+        is at rest and removed, using the saved bias for the device address.
+        """
+        super().__init__(controller, *args, **kwargs)
+        self.calibration = (
+            GyroscopeCalibration.load(controller.address) if calibrate else None
+        )
+
     async def callback(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
         """Define callback to handle mouse events."""
         await super().callback(sender, data)
 
-        # Gyroscope attributes refer to axes of rotation, hence the
-        # y-coordinate relates to rotation about the x-axis.
-        y, x = -self.controller.gyroscope.x, -self.controller.gyroscope.y
-        await self.move(*self._calculate_movement(x, y))
+        movement = gyroscope_movement(
+            self.frame.gyroscope, self.frame.accelerometer, self.calibration
+        )
+        x, y = self._calculate_movement(*movement)
+        # Avoid emitting events while at rest
+        if x or y:
+            await self.move(x, y)
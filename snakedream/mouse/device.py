@@ -38,19 +38,22 @@ class UInputMouse(BaseMouse, uinput.Device):
 
     async def move(self, x: int, y: int) -> None:
         """Move mouse to specified location."""
-        self.emit(uinput.REL_X, x)
-        self.emit(uinput.REL_Y, y)
+        with self._span("UInputMouse.move"):
+            self.emit(uinput.REL_X, x)
+            self.emit(uinput.REL_Y, y)
 
     async def scroll(self, value: int) -> None:
         """Scroll view by specified value."""
-        self.emit(uinput.REL_WHEEL, value)
+        with self._span("UInputMouse.scroll"):
+            self.emit(uinput.REL_WHEEL, value)
 
     async def click(
         self, button: InputEvent = uinput.BTN_LEFT, value: Optional[int] = None
     ) -> None:
         """Click specified mouse button."""
-        if value is not None:
-            self.emit(button, value)
-            return
-        self.emit(button, 1)
-        self.emit(button, 0)
+        with self._span("UInputMouse.click"):
+            if value is not None:
+                self.emit(button, value)
+                return
+            self.emit(button, 1)
+            self.emit(button, 0)
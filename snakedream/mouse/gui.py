@@ -17,20 +17,23 @@ class PyAutoGUIMouse(BaseMouse):
 
     async def move(self, x: int, y: int) -> None:
         """Move mouse to specified location."""
-        pyautogui.move(x, y)
+        with self._span("PyAutoGUIMouse.move"):
+            pyautogui.move(x, y)
 
     async def scroll(self, value: int) -> None:
         """Scroll view by specified value."""
-        pyautogui.scroll(value)
+        with self._span("PyAutoGUIMouse.scroll"):
+            pyautogui.scroll(value)
 
     async def click(
         self, button: InputEvent = "left", value: Optional[int] = None
     ) -> None:
         """Click specified mouse button."""
-        if value is not None:
-            if value == 1:
-                pyautogui.mouseDown(button=button)
-            elif value == 0:
-                pyautogui.mouseUp(button=button)
-            return
-        pyautogui.click(button=button)
+        with self._span("PyAutoGUIMouse.click"):
+            if value is not None:
+                if value == 1:
+                    pyautogui.mouseDown(button=button)
+                elif value == 0:
+                    pyautogui.mouseUp(button=button)
+                return
+            pyautogui.click(button=button)
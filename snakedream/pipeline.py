@@ -0,0 +1,341 @@
+"""Compose processing stages into a fused pipeline."""
+
+import inspect
+import json
+import socket
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, Optional, TextIO
+
+from bleak import BleakGATTCharacteristic
+
+from snakedream import config
+from snakedream.base import BaseCallback
+from snakedream.calibration import GyroscopeCalibration
+from snakedream.device import DaydreamController
+from snakedream.models import ModelJSONEncoder
+from snakedream.mouse.base import (
+    ButtonMapping,
+    MouseFactory,
+    gyroscope_movement,
+    touchpad_movement,
+)
+
+type StageDefinition = dict[str, Any]
+type StageResult = Optional[bool] | Awaitable[Optional[bool]]
+
+
+class Frame:
+    """
+    Class to represent state shared between stages for each frame.
+
+    A single instance is reused by a pipeline, so stages should write results
+    to its attributes rather than creating new objects.
+    """
+
+    __slots__ = ("data", "values", "x", "y")
+
+    def __init__(self) -> None:
+        """Initialise empty frame."""
+        self.data = bytearray()
+        self.values: dict[str, Any] = {}
+        self.x = 0.0
+        self.y = 0.0
+
+
+class Stage:
+    """
+    Base class for pipeline stages.
+
+    Stages are called with the current frame, and may return False to stop
+    processing of the frame by later stages. Stages which need to await output
+    may define __call__ as a coroutine function.
+    """
+
+    def __init__(self, controller: DaydreamController) -> None:
+        """Initialise stage with controller."""
+        self.controller = controller
+
+    def __call__(self, frame: Frame) -> StageResult:
+        """Process frame."""
+        return None
+
+
+class GyroscopeStage(Stage):
+    """Stage to map gyroscope rotation to movement."""
+
+    def __init__(
+        self,
+        controller: DaydreamController,
+        sensitivity: float = 8,
+        calibrate: bool = True,
+    ) -> None:
+        """
+        Initialise stage with sensitivity.
+
+        If calibrate is True, gyroscope bias is estimated while the controller
+        is at rest and removed, using the saved bias for the device address.
+        """
+        super().__init__(controller)
+        self.sensitivity = sensitivity
+        self.calibration = (
+            GyroscopeCalibration.load(controller.address) if calibrate else None
+        )
+
+    def __call__(self, frame: Frame) -> Optional[bool]:
+        """Set movement from rotation about x and y axes."""
+        x, y = gyroscope_movement(
+            frame.values["gyroscope"], frame.values["accelerometer"], self.calibration
+        )
+        frame.x, frame.y = x * self.sensitivity, y * self.sensitivity
+        return None
+
+
+class TouchpadStage(Stage):
+    """Stage to map touchpad position to movement."""
+
+    def __init__(self, controller: DaydreamController, sensitivity: float = 8) -> None:
+        """Initialise stage with sensitivity."""
+        super().__init__(controller)
+        self.sensitivity = sensitivity
+
+    def __call__(self, frame: Frame) -> Optional[bool]:
+        """Set movement from touchpad position, relative to centre."""
+        movement = touchpad_movement(frame.values["touchpad"])
+        if movement is None:
+            frame.x = frame.y = 0.0
+            return None
+        x, y = movement
+        frame.x, frame.y = x * self.sensitivity, y * self.sensitivity
+        return None
+
+
+class SmoothStage(Stage):
+    """Stage to smooth movement with an exponential moving average."""
+
+    def __init__(self, controller: DaydreamController, alpha: float = 0.5) -> None:
+        """Initialise stage with smoothing factor."""
+        super().__init__(controller)
+        self.alpha = alpha
+        self._x = 0.0
+        self._y = 0.0
+
+    def __call__(self, frame: Frame) -> Optional[bool]:
+        """Replace movement with smoothed movement."""
+        self._x += self.alpha * (frame.x - self._x)
+        self._y += self.alpha * (frame.y - self._y)
+        frame.x, frame.y = self._x, self._y
+        return None
+
+
+class DeadzoneStage(Stage):
+    """Stage to discard movement smaller than threshold."""
+
+    def __init__(self, controller: DaydreamController, threshold: float = 0.5) -> None:
+        """Initialise stage with threshold."""
+        super().__init__(controller)
+        self.threshold = threshold
+
+    def __call__(self, frame: Frame) -> Optional[bool]:
+        """Set movement below threshold to zero."""
+        if abs(frame.x) < self.threshold and abs(frame.y) < self.threshold:
+            frame.x = frame.y = 0.0
+        return None
+
+
+class PipelineMouse(MouseFactory.get(config.MOUSE_BACKEND)):
+    """Mouse subclass to output movement and buttons of pipeline frames."""
+
+    async def callback(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
+        """Define callback to handle mouse events."""
+        await super().callback(sender, data)
+
+
+class MouseStage(Stage):
+    """Stage to output movement and buttons with the configured mouse backend."""
+
+    def __init__(
+        self,
+        controller: DaydreamController,
+        buttons: Optional[Iterable[dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Initialise mouse device.
+
+        Buttons are defined by a list of dictionaries with the arguments of
+        ButtonMapping, or the default mouse button mapping is used if omitted.
+        """
+        super().__init__(controller)
+        kwargs: dict[str, Any] = {}
+        if buttons is not None:
+            kwargs["buttons"] = [ButtonMapping(**mapping) for mapping in buttons]
+        self.mouse = PipelineMouse(controller, **kwargs)
+
+    async def __call__(self, frame: Frame) -> Optional[bool]:
+        """Handle buttons and move mouse by current movement."""
+        await self.mouse.handle_buttons(frame.values["buttons"])
+        x, y = round(frame.x), round(frame.y)
+        if x or y:
+            await self.mouse.move(x, y)
+        return None
+
+
+class JSONStage(Stage):
+    """Stage to write parsed data as JSON lines, at most once per interval."""
+
+    def __init__(
+        self,
+        controller: DaydreamController,
+        interval: float = 1,
+        file: TextIO = sys.stdout,
+    ) -> None:
+        """Initialise stage with interval in seconds and output file."""
+        super().__init__(controller)
+        self.interval = interval
+        self.file = file
+        self._last = 0.0
+
+    def __call__(self, frame: Frame) -> Optional[bool]:
+        """Write parsed data if interval has elapsed."""
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self.file.write(json.dumps(frame.values, cls=ModelJSONEncoder) + "\n")
+            self._last = now
+        return None
+
+
+class UDPStage(Stage):
+    """Stage to send parsed data as JSON datagrams."""
+
+    def __init__(
+        self,
+        controller: DaydreamController,
+        host: str = "127.0.0.1",
+        port: int = 5005,
+    ) -> None:
+        """Initialise UDP socket with destination address."""
+        super().__init__(controller)
+        self.address = (host, port)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+    def __call__(self, frame: Frame) -> Optional[bool]:
+        """Send parsed data, dropping datagrams if socket is not ready."""
+        try:
+            self.socket.sendto(
+                json.dumps(frame.values, cls=ModelJSONEncoder).encode(), self.address
+            )
+        except BlockingIOError:
+            pass
+        return None
+
+
+STAGES: dict[str, type[Stage]] = {
+    "gyroscope": GyroscopeStage,
+    "touchpad": TouchpadStage,
+    "smooth": SmoothStage,
+    "deadzone": DeadzoneStage,
+    "mouse": MouseStage,
+    "json": JSONStage,
+    "udp": UDPStage,
+}
+
+
+def fuse(
+    stages: Iterable[Stage],
+) -> Callable[[Frame], Awaitable[None]]:
+    """
+    Return single coroutine function which calls stages in order.
+
+    Stages are bound to a tuple once, with whether each must be awaited, so
+    processing a frame does not check the type of each stage.
+    """
+    bound = tuple(
+        (stage, inspect.iscoroutinefunction(stage.__call__)) for stage in stages
+    )
+
+    async def fused(frame: Frame) -> None:
+        """Process frame through stages, until a stage returns False."""
+        for stage, coroutine in bound:
+            result = stage(frame)
+            if coroutine:
+                result = await result
+            if result is False:
+                return None
+
+    return fused
+
+
+def validate_definition(definition: Any) -> list[StageDefinition]:
+    """Return definition of stages, raising ValueError if it is invalid."""
+    if not isinstance(definition, list):
+        raise ValueError("Pipeline definition must be a list of stages")
+    for stage in definition:
+        if not isinstance(stage, dict) or "stage" not in stage:
+            raise ValueError(f"Invalid stage {stage!r}. Must contain the 'stage' key")
+        arguments = dict(stage)
+        name = arguments.pop("stage")
+        if name not in STAGES:
+            raise ValueError(
+                f"Invalid stage '{name}'. Must be one of: {', '.join(STAGES)}"
+            )
+        try:
+            # Check arguments without creating stage, which may open devices
+            inspect.signature(STAGES[name]).bind(None, **arguments)
+        except TypeError as error:
+            raise ValueError(
+                f"Invalid arguments for stage '{name}': {error}"
+            ) from error
+    return definition
+
+
+def load_definition(path: str) -> list[StageDefinition]:
+    """Return validated definition of stages from JSON file."""
+    with open(path) as file:
+        return validate_definition(json.load(file))
+
+
+class Pipeline(BaseCallback):
+    """Handle pipeline of stages connected for each controller frame."""
+
+    def __init__(self, controller: DaydreamController, stages: Iterable[Stage]) -> None:
+        """Initialise pipeline and fuse stages."""
+        super().__init__(controller)
+        self.stages = list(stages)
+        self.frame = Frame()
+        self._process = fuse(self.stages)
+
+    @classmethod
+    def from_definition(
+        cls: type["Pipeline"],
+        controller: DaydreamController,
+        definition: Iterable[StageDefinition],
+    ) -> "Pipeline":
+        """
+        Return pipeline from definition of stages.
+
+        Each stage is defined by a dictionary containing the stage name with
+        the "stage" key, and any other keys as arguments, e.g.
+        {"stage": "gyroscope", "sensitivity": 8}.
+        """
+        stages = []
+        for stage in validate_definition(list(definition)):
+            arguments = dict(stage)
+            name = arguments.pop("stage")
+            stages.append(STAGES[name](controller, **arguments))
+        return cls(controller, stages)
+
+    @classmethod
+    def from_file(
+        cls: type["Pipeline"], controller: DaydreamController, path: str
+    ) -> "Pipeline":
+        """Return pipeline from JSON file containing list of stage definitions."""
+        return cls.from_definition(controller, load_definition(path))
+
+    async def callback(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
+        """Define callback to process frame through fused stages."""
+        frame = self.frame
+        frame.data = data
+        frame.values = self.controller._data
+        await self._process(frame)
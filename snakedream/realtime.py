@@ -0,0 +1,115 @@
+"""Apply low-latency scheduling profile to the input pipeline."""
+
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class RealtimeProfile:
+    """
+    Dataclass to represent scheduling settings for low-latency operation.
+
+    CPU affinity and event loop are applied to the process before the loop is
+    started, with the apply method. Priority is only applied to the thread
+    running the event loop, which handles notifications and emits events, with
+    the apply_loop method from within the running loop.
+    """
+
+    loop: str = "uvloop"
+    cpus: Optional[set[int]] = None
+    priority: int = 10
+    nice: int = -10
+    applied: list[str] = field(default_factory=list)
+    _nice: int = field(default=0, init=False, repr=False)
+
+    def loop_factory(self) -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+        """Return factory for faster event loop implementation if installed."""
+        if self.loop == "uvloop":
+            try:
+                import uvloop
+            except ImportError:
+                self.applied.append("Event loop: uvloop not installed, using asyncio")
+                return None
+            self.applied.append("Event loop: uvloop")
+            return uvloop.new_event_loop
+        self.applied.append("Event loop: asyncio")
+        return None
+
+    def set_affinity(self) -> None:
+        """Pin process to configured CPUs where supported."""
+        if not self.cpus:
+            return None
+        if not hasattr(os, "sched_setaffinity"):
+            self.applied.append("CPU affinity: not supported on this platform")
+            return None
+        try:
+            os.sched_setaffinity(0, self.cpus)
+        except OSError as error:
+            self.applied.append(f"CPU affinity: failed ({error.strerror})")
+            return None
+        cpus = ", ".join(str(cpu) for cpu in sorted(self.cpus))
+        self.applied.append(f"CPU affinity: {cpus}")
+
+    def set_priority(self) -> None:
+        """Raise priority of calling thread with SCHED_FIFO, or nice level."""
+        if hasattr(os, "getpriority"):
+            self._nice = os.getpriority(os.PRIO_PROCESS, 0)
+        if hasattr(os, "sched_setscheduler"):
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.priority))
+            except OSError as error:
+                self.applied.append(f"SCHED_FIFO: failed ({error.strerror})")
+            else:
+                self.applied.append(f"SCHED_FIFO: priority {self.priority}")
+                return None
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, self.nice)
+        except (AttributeError, OSError) as error:
+            reason = getattr(error, "strerror", None) or "not supported"
+            self.applied.append(f"Nice level: failed ({reason})")
+        else:
+            self.applied.append(f"Nice level: {self.nice}")
+
+    def reset_priority(self) -> None:
+        """Restore default scheduling policy and nice level of calling thread."""
+        if hasattr(os, "sched_setscheduler"):
+            try:
+                os.sched_setscheduler(0, os.SCHED_OTHER, os.sched_param(0))
+            except OSError:
+                pass
+        if hasattr(os, "setpriority"):
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, self._nice)
+            except OSError:
+                pass
+
+    def apply(self) -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+        """Apply profile to current process and return event loop factory."""
+        self.set_affinity()
+        return self.loop_factory()
+
+    def apply_loop(self) -> None:
+        """
+        Raise priority of running event loop thread.
+
+        Threads created later by the calling thread inherit its priority, so
+        the default executor of the loop is replaced with one whose threads
+        restore the default priority.
+        """
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(initializer=self.reset_priority)
+        )
+        self.set_priority()
+
+
+def parse_cpus(value: str) -> set[int]:
+    """Return set of CPUs from comma-separated list, with optional ranges."""
+    cpus: set[int] = set()
+    for part in value.split(","):
+        start, _, end = part.partition("-")
+        cpus.update(range(int(start), int(end or start) + 1))
+    return cpus
@@ -0,0 +1,85 @@
+"""Stream controller frames with async iterators."""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from enum import StrEnum, auto
+from typing import Any, Optional
+
+
+class StreamPolicy(StrEnum):
+    """String enumeration for handling frames when stream is full."""
+
+    ALL = auto()  # Keep queued frames in order, dropping new frames
+    LATEST = auto()  # Coalesce to latest frames, dropping oldest frames
+
+
+class FrameStream:
+    """
+    Class to provide async iterator of frames backed by a bounded queue.
+
+    Frames are added without blocking, so slow consumers do not delay the
+    notification callback. Frames which do not fit in the queue are counted
+    by the dropped attribute.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 64,
+        policy: StreamPolicy | str = StreamPolicy.ALL,
+        on_close: Optional[Callable[["FrameStream"], None]] = None,
+    ) -> None:
+        """Initialise stream with queue size and policy for full queue."""
+        if maxsize < 1:
+            raise ValueError("Argument 'maxsize' must be at least 1")
+        self.maxsize = maxsize
+        self.policy = StreamPolicy(policy)
+        self.dropped = 0
+        self.closed = False
+        self._on_close = on_close
+        self._frames: deque[Any] = deque()
+        self._event = asyncio.Event()
+
+    def __aiter__(self) -> "FrameStream":
+        """Return stream as async iterator."""
+        return self
+
+    async def __anext__(self) -> Any:
+        """Return next frame, waiting until one is available."""
+        while not self._frames:
+            if self.closed:
+                raise StopAsyncIteration
+            self._event.clear()
+            await self._event.wait()
+        return self._frames.popleft()
+
+    async def __aenter__(self) -> "FrameStream":
+        """Return stream on entering context."""
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Close stream on exiting context."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return number of queued frames."""
+        return len(self._frames)
+
+    def put(self, frame: Any) -> None:
+        """Add frame to queue according to policy."""
+        if len(self._frames) >= self.maxsize:
+            self.dropped += 1
+            if self.policy == StreamPolicy.ALL:
+                return None
+            self._frames.popleft()
+        self._frames.append(frame)
+        self._event.set()
+
+    def close(self) -> None:
+        """Stop receiving frames, ending iteration once queue is empty."""
+        if self.closed:
+            return None
+        self.closed = True
+        self._event.set()
+        if self._on_close:
+            self._on_close(self)
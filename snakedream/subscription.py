@@ -0,0 +1,104 @@
+"""Dispatch changes of individual controller fields to subscribers."""
+
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import astuple, dataclass, field, is_dataclass
+from typing import Any
+
+from snakedream.models import BaseModel, ModelDefinition
+
+type SubscriptionCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+@dataclass(eq=False)
+class Subscription:
+    """
+    Dataclass to represent a callback subscribed to controller fields.
+
+    Fields are specified by model name, e.g. "touchpad", or model name and
+    attribute, e.g. "buttons.click".
+    """
+
+    callback: SubscriptionCallback
+    fields: tuple[str, ...]
+    threshold: float = 0
+    _last: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def exceeds(self, name: str, value: Any) -> bool:
+        """Return whether value differs from last delivered value by threshold."""
+        if name not in self._last:
+            return True
+        last = self._last[name]
+        if isinstance(value, bool) or not self.threshold:
+            return value != last
+        if is_dataclass(value) and not isinstance(value, type):
+            return any(
+                abs(new - old) > self.threshold
+                for new, old in zip(astuple(value), astuple(last))
+            )
+        return abs(value - last) > self.threshold
+
+
+class SubscriptionIndex:
+    """Class to index subscriptions by field and dispatch changed values."""
+
+    def __init__(self, definitions: Iterable[ModelDefinition]) -> None:
+        """Initialise index with model definitions to validate fields."""
+        self._definitions = {definition.name: definition for definition in definitions}
+        self._index: dict[str, list[Subscription]] = {}
+        self._getters: dict[str, Callable[[dict[str, Any]], Any]] = {}
+        self._values: dict[str, Any] = {}
+
+    def __bool__(self) -> bool:
+        """Return whether any fields are subscribed."""
+        return bool(self._index)
+
+    def _getter(self, name: str) -> Callable[[dict[str, Any]], Any]:
+        """Return function to get value of field from parsed data."""
+        model, _, attribute = name.partition(".")
+        definition = self._definitions.get(model)
+        if definition is None:
+            raise ValueError(f"Invalid field '{name}'. Unknown model '{model}'")
+        if not attribute:
+            return lambda data: data[model]
+        if not isinstance(definition.data, dict) or attribute not in definition.data:
+            raise ValueError(
+                f"Invalid field '{name}'. Model '{model}' has no field '{attribute}'"
+            )
+        return lambda data: getattr(data[model], attribute)
+
+    def add(self, subscription: Subscription) -> None:
+        """Add subscription to index for each of its fields."""
+        getters = {name: self._getter(name) for name in subscription.fields}
+        for name in subscription.fields:
+            self._getters.setdefault(name, getters[name])
+            self._index.setdefault(name, []).append(subscription)
+            # Treat field as changed on next dispatch, so the new subscriber
+            # receives the current value. Existing subscribers are not called
+            # again, as their last delivered value is unchanged.
+            self._values.pop(name, None)
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove subscription from index."""
+        for name in subscription.fields:
+            subscribers = self._index.get(name, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._index.pop(name, None)
+                self._getters.pop(name, None)
+                self._values.pop(name, None)
+
+    async def dispatch(self, data: dict[str, float | BaseModel]) -> None:
+        """Call subscribers with values of subscribed fields which changed."""
+        pending: dict[Subscription, dict[str, Any]] = {}
+        for name, getter in self._getters.items():
+            value = getter(data)
+            if name in self._values and self._values[name] == value:
+                continue
+            self._values[name] = value
+            for subscription in self._index[name]:
+                if subscription.exceeds(name, value):
+                    pending.setdefault(subscription, {})[name] = value
+        for subscription, changes in pending.items():
+            subscription._last.update(changes)
+            await subscription.callback(changes)
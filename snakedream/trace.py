@@ -0,0 +1,133 @@
+"""Record per-frame spans in Chrome trace-event format."""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Optional, TextIO
+
+
+class Tracer:
+    """
+    Class to record spans and write them to file with a background thread.
+
+    Output uses the Chrome trace-event JSON format, which can be opened with
+    Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 512) -> None:
+        """Initialise instance with output path and number of events to buffer."""
+        self.path = path
+        self.buffer_size = buffer_size
+        self._pid = os.getpid()
+        self._events: list[dict[str, Any]] = []
+        self._queue: queue.SimpleQueue[Optional[list[dict[str, Any]]]] = (
+            queue.SimpleQueue()
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "Tracer":
+        """Start writer thread on entering context."""
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Flush events and stop writer thread on exiting context."""
+        self.close()
+
+    def start(self) -> None:
+        """Start background thread to write events to file."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._write, name="snakedream-trace", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Flush buffered events and wait for writer thread to finish."""
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def flush(self) -> None:
+        """Pass buffered events to writer thread."""
+        if self._events:
+            self._queue.put(self._events)
+            self._events = []
+
+    def _write(self) -> None:
+        """Write batches of events to file until closed."""
+        with open(self.path, "w") as file:
+            file.write('{"traceEvents":[\n')
+            self._write_event(
+                file,
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "args": {"name": "snakedream"},
+                },
+                first=True,
+            )
+            while (events := self._queue.get()) is not None:
+                for event in events:
+                    self._write_event(file, event)
+            file.write('\n],"displayTimeUnit":"ms"}\n')
+
+    @staticmethod
+    def _write_event(file: TextIO, event: dict[str, Any], first: bool = False) -> None:
+        """Write single event to file."""
+        if not first:
+            file.write(",\n")
+        file.write(json.dumps(event, separators=(",", ":")))
+
+    def _add(self, event: dict[str, Any]) -> None:
+        """Add event to buffer, passing to writer thread when full."""
+        self._events.append(event)
+        if len(self._events) >= self.buffer_size:
+            self.flush()
+
+    def instant(self, name: str, **args: Any) -> None:
+        """Record instant event with arguments."""
+        self._add(
+            {
+                "name": name,
+                "ph": "i",
+                "s": "t",
+                "ts": time.perf_counter_ns() / 1000,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Record duration of context as complete event with arguments."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self._add(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": start / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": self._pid,
+                    "tid": threading.get_ident(),
+                    "args": args,
+                }
+            )
+
+
+def span(tracer: Optional[Tracer], name: str, **args: Any) -> ContextManager[None]:
+    """Return span context for tracer, or no-op context if tracing is disabled."""
+    return tracer.span(name, **args) if tracer is not None else nullcontext()